@@ -1,26 +1,12 @@
 import pkg from '@slack/bolt';
 const { App, ExpressReceiver } = pkg;
-import { initializeDatabase } from './database/db.js';
+import { getDatabase, closeDatabase } from './database/db.js';
 import { handleMessage } from './handlers/messageHandler.js';
 import { handleCommand } from './handlers/commandHandler.js';
 import { buildVacationModal } from './modals/vacationModal.js';
 import { ensureUser } from './services/streakService.js';
 import { addDateRangeDayOff } from './services/daysOffService.js';
-import { mkdir } from 'fs/promises';
-import { dirname } from 'path';
-
-// Initialize database
-const dbPath = process.env.DATABASE_PATH || './data/slackline.db';
-
-// Ensure data directory exists
-try {
-  await mkdir(dirname(dbPath), { recursive: true });
-} catch (error) {
-  console.error('Failed to create data directory:', error);
-}
-
-initializeDatabase(dbPath);
-console.log('✅ Database initialized');
+import { getUserTimezone } from './utils/slackUtils.js';
 
 // Verify environment variables are set
 const signingSecretLength = process.env.SLACK_SIGNING_SECRET?.length || 0;
@@ -34,20 +20,33 @@ console.log('🔍 Environment check:', {
   NODE_ENV: process.env.NODE_ENV || 'not set'
 });
 
-// Create custom logger for Bolt to ensure output goes to console
+// Create custom logger for Bolt to ensure output goes to console.
+// Messages below the configured level return before formatting anything,
+// so Bolt's per-request debug output costs nothing in production.
+const LOG_LEVELS = ['debug', 'info', 'warn', 'error'];
+let minLogLevel = LOG_LEVELS.indexOf('info');
+
 const logger = {
-  debug: (...msgs) => console.log('[BOLT DEBUG]', ...msgs),
-  info: (...msgs) => console.log('[BOLT INFO]', ...msgs),
-  warn: (...msgs) => console.warn('[BOLT WARN]', ...msgs),
+  debug: (...msgs) => { if (minLogLevel <= 0) console.log('[BOLT DEBUG]', ...msgs); },
+  info: (...msgs) => { if (minLogLevel <= 1) console.log('[BOLT INFO]', ...msgs); },
+  warn: (...msgs) => { if (minLogLevel <= 2) console.warn('[BOLT WARN]', ...msgs); },
   error: (...msgs) => console.error('[BOLT ERROR]', ...msgs),
-  setLevel: () => {},
-  getLevel: () => 'DEBUG',
+  setLevel: (level) => {
+    const index = LOG_LEVELS.indexOf(String(level).toLowerCase());
+    if (index !== -1) {
+      minLogLevel = index;
+    }
+  },
+  getLevel: () => LOG_LEVELS[minLogLevel],
   setName: () => {}
 };
 
 // Create a custom receiver with health check endpoints
 const receiver = new ExpressReceiver({
-  signingSecret: process.env.SLACK_SIGNING_SECRET
+  signingSecret: process.env.SLACK_SIGNING_SECRET,
+  // Ack events as soon as they arrive, before listeners do any Slack API or
+  // database work, so the 3-second ack deadline never depends on that work
+  processBeforeResponse: false
 });
 
 // Add health check endpoints to the Express router
@@ -71,11 +70,30 @@ receiver.router.get('/version', (req, res) => {
 // Initialize Bolt app with custom receiver and logger
 const app = new App({
   token: process.env.SLACK_BOT_TOKEN,
+  // When both IDs are provided Bolt skips its auth.test round trip at boot
+  botId: process.env.SLACK_BOT_ID,
+  botUserId: process.env.SLACK_BOT_USER_ID,
   receiver,
   logger: logger,
-  logLevel: 'INFO' // Use INFO level for production
+  logLevel: process.env.LOG_LEVEL || 'INFO', // Use INFO level for production
+  clientOptions: {
+    // Keep bursts of Web API calls small so per-method rate limits aren't tripped.
+    // The WebClient already waits out Retry-After on 429s; cap retries so a
+    // struggling API can't stall handlers for the default ~30 minutes.
+    maxRequestConcurrency: 4,
+    retryConfig: { retries: 3, factor: 2 }
+  }
 });
 
+// Initialize database. This runs after the App is constructed so Bolt's
+// token verification (auth.test), if needed, is already in flight while we set up storage.
+const dbPath = process.env.DATABASE_PATH || './data/slackline.db';
+
+// Open the shared connection up front so handlers reuse it instead of
+// opening a second one on first use
+getDatabase(dbPath);
+console.log('✅ Database initialized');
+
 // Register message handler with error handling
 app.message(async (args) => {
   try {
@@ -127,8 +145,7 @@ app.view('vacation_submission', async ({ ack, body, view, client }) => {
     const userId = body.user.id;
 
     // Get user's timezone
-    const userInfo = await client.users.info({ user: userId });
-    const timezone = userInfo.user.tz || 'UTC';
+    const timezone = await getUserTimezone(client, userId);
 
     // Ensure user exists and add the vacation dates
     const user = ensureUser(userId, timezone);
@@ -163,11 +180,13 @@ const port = process.env.PORT || 3000;
 process.on('SIGTERM', async () => {
   console.log('SIGTERM received, shutting down gracefully...');
   await app.stop();
+  closeDatabase();
   process.exit(0);
 });
 
 process.on('SIGINT', async () => {
   console.log('SIGINT received, shutting down gracefully...');
   await app.stop();
+  closeDatabase();
   process.exit(0);
 });
@@ -1,19 +1,38 @@
 import Database from 'better-sqlite3';
-import { readFileSync } from 'fs';
+import { mkdirSync, readFileSync } from 'fs';
 import { dirname, join } from 'path';
 import { fileURLToPath } from 'url';
 
 const __dirname = dirname(fileURLToPath(import.meta.url));
 const schemaPath = join(__dirname, 'schema.sql');
 
+// Schema file contents, read once per process
+let schema = null;
+
 export function initializeDatabase(dbPath = process.env.DATABASE_PATH || './data/slackline.db') {
+  // Ensure data directory exists; recursive mkdir is a no-op when it already does
+  const dataDir = dirname(dbPath);
+  if (dbPath !== ':memory:' && dataDir !== '.') {
+    mkdirSync(dataDir, { recursive: true });
+  }
+
   const db = new Database(dbPath);
 
   // Enable foreign keys
   db.pragma('foreign_keys = ON');
 
+  // WAL lets reads proceed alongside a write and, with synchronous=NORMAL,
+  // avoids an fsync on every commit. better-sqlite3 already sets a 5s busy timeout.
+  const journalMode = db.pragma('journal_mode = WAL', { simple: true });
+  if (journalMode !== 'wal' && !db.memory) {
+    console.warn(`⚠️ Could not enable WAL journal mode (using ${journalMode})`);
+  }
+  db.pragma('synchronous = NORMAL');
+
   // Read and execute schema
-  const schema = readFileSync(schemaPath, 'utf-8');
+  if (schema === null) {
+    schema = readFileSync(schemaPath, 'utf-8');
+  }
   db.exec(schema);
 
   // Run migrations
@@ -37,9 +56,46 @@ function runMigrations(db) {
   }
 }
 
-export function getDatabase() {
+// Compiled statements per connection, keyed by SQL text
+const statementCaches = new WeakMap();
+
+/**
+ * Prepare a statement, reusing the compiled statement on later calls
+ * with the same SQL instead of recompiling it each time
+ */
+export function prepareCached(db, sql) {
+  let cache = statementCaches.get(db);
+  if (!cache) {
+    cache = new Map();
+    statementCaches.set(db, cache);
+  }
+
+  let statement = cache.get(sql);
+  if (!statement) {
+    statement = db.prepare(sql);
+    cache.set(sql, statement);
+  }
+  return statement;
+}
+
+/**
+ * Get the shared database connection, opening it on first use
+ */
+export function getDatabase(dbPath) {
   if (!global.__db) {
-    global.__db = initializeDatabase();
+    global.__db = initializeDatabase(dbPath);
   }
   return global.__db;
 }
+
+/**
+ * Close the shared database connection, letting SQLite refresh its
+ * query planner statistics first
+ */
+export function closeDatabase() {
+  if (global.__db) {
+    global.__db.pragma('optimize');
+    global.__db.close();
+    global.__db = null;
+  }
+}
@@ -43,7 +43,11 @@ CREATE TABLE IF NOT EXISTS days_off (
 );
 
 -- Indexes for performance
-CREATE INDEX IF NOT EXISTS idx_users_slack_user_id ON users(slack_user_id);
-CREATE INDEX IF NOT EXISTS idx_channels_slack_channel_id ON channels(slack_channel_id);
-CREATE INDEX IF NOT EXISTS idx_streaks_user_channel ON streaks(user_id, channel_id);
+-- Lookups on users.slack_user_id, channels.slack_channel_id and
+-- streaks(user_id, channel_id) use the indexes behind their UNIQUE constraints
 CREATE INDEX IF NOT EXISTS idx_days_off_user_id ON days_off(user_id);
+
+-- Drop indexes that duplicated those UNIQUE constraints and only slowed inserts
+DROP INDEX IF EXISTS idx_users_slack_user_id;
+DROP INDEX IF EXISTS idx_channels_slack_channel_id;
+DROP INDEX IF EXISTS idx_streaks_user_channel;
@@ -1,11 +1,47 @@
-import { getStreakStats } from '../services/streakService.js';
+import { getStreakStats, ensureUser } from '../services/streakService.js';
 import {
   addDateRangeDayOff,
   setWeekendDaysOff,
   getUserDaysOff
 } from '../services/daysOffService.js';
-import { ensureUser } from '../services/streakService.js';
 import { buildVacationModal } from '../modals/vacationModal.js';
+import { getUserTimezone } from '../utils/slackUtils.js';
+import { formatDayCount } from '../utils/dateUtils.js';
+
+const DATE_PATTERN = /^\d{4}-\d{2}-\d{2}$/;
+
+// Indexed by days_off.day_value (0=Sunday)
+const WEEKDAY_NAMES = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'];
+
+const HELP_TEXT = `*Slackline Bot Commands*
+
+• \`/slackline help\` - Show this help message
+• \`/slackline stats\` - View your current streak and total check-ins
+• \`/slackline settings\` - Open vacation date picker
+• \`/slackline dayoff <date>\` - Mark a single day off (YYYY-MM-DD)
+  Example: \`/slackline dayoff 2024-12-25\`
+• \`/slackline vacation <start> <end>\` - Mark a vacation range
+  Example: \`/slackline vacation 2024-12-20 2024-12-31\`
+• \`/slackline weekends <on|off>\` - Toggle Saturday/Sunday as days off
+• \`/slackline list-daysoff\` - Show your configured days off
+
+_Tip: You can also use the ⚡ shortcuts menu → "Set Vacation Dates"_`;
+
+const DAYOFF_USAGE = '❌ Usage: `/slackline dayoff <date>`\nExample: `/slackline dayoff 2024-12-25`';
+const VACATION_USAGE = '❌ Usage: `/slackline vacation <start-date> <end-date>`\nExample: `/slackline vacation 2024-12-20 2024-12-31`';
+const WEEKENDS_USAGE = '❌ Usage: `/slackline weekends <on|off>`';
+
+// Subcommand dispatch table; every handler takes (command, args, respond, client)
+const SUBCOMMAND_HANDLERS = new Map([
+  ['', handleHelp],
+  ['help', handleHelp],
+  ['stats', handleStats],
+  ['dayoff', handleDayOff],
+  ['vacation', handleVacation],
+  ['weekends', handleWeekends],
+  ['list-daysoff', handleListDaysOff],
+  ['settings', handleSettings]
+]);
 
 /**
  * Handle /slackline slash command
@@ -19,37 +55,19 @@ export async function handleCommand({ command, ack, respond, client }) {
   }
 
   try {
-    const subcommand = command.text.trim().split(' ')[0].toLowerCase();
-    const args = command.text.trim().split(' ').slice(1);
-
-    switch (subcommand) {
-      case 'help':
-      case '':
-        await handleHelp(respond);
-        break;
-      case 'stats':
-        await handleStats(command, respond);
-        break;
-      case 'dayoff':
-        await handleDayOff(command, args, respond, client);
-        break;
-      case 'vacation':
-        await handleVacation(command, args, respond, client);
-        break;
-      case 'weekends':
-        await handleWeekends(command, args, respond, client);
-        break;
-      case 'list-daysoff':
-        await handleListDaysOff(command, respond, client);
-        break;
-      case 'settings':
-        await handleSettings(command, respond, client);
-        break;
-      default:
-        await respond({
-          text: `Unknown command: ${subcommand}\n\nUse \`/slackline help\` to see available commands.`,
-          response_type: 'ephemeral'
-        });
+    // Tokenize once; splitting on runs of whitespace also tolerates double spaces
+    const [name, ...args] = command.text.trim().split(/\s+/);
+    const subcommand = name.toLowerCase();
+
+    const handler = SUBCOMMAND_HANDLERS.get(subcommand);
+
+    if (handler) {
+      await handler(command, args, respond, client);
+    } else {
+      await respond({
+        text: `Unknown command: ${subcommand}\n\nUse \`/slackline help\` to see available commands.`,
+        response_type: 'ephemeral'
+      });
     }
   } catch (error) {
     console.error('Error handling command:', error);
@@ -60,26 +78,22 @@ export async function handleCommand({ command, ack, respond, client }) {
   }
 }
 
-async function handleHelp(respond) {
-  await respond({
-    text: `*Slackline Bot Commands*
-
-• \`/slackline help\` - Show this help message
-• \`/slackline stats\` - View your current streak and total check-ins
-• \`/slackline settings\` - Open vacation date picker
-• \`/slackline dayoff <date>\` - Mark a single day off (YYYY-MM-DD)
-  Example: \`/slackline dayoff 2024-12-25\`
-• \`/slackline vacation <start> <end>\` - Mark a vacation range
-  Example: \`/slackline vacation 2024-12-20 2024-12-31\`
-• \`/slackline weekends <on|off>\` - Toggle Saturday/Sunday as days off
-• \`/slackline list-daysoff\` - Show your configured days off
+/**
+ * Resolve the invoking user's timezone and make sure they exist in the database
+ */
+async function ensureCommandUser(command, client) {
+  const timezone = await getUserTimezone(client, command.user_id);
+  return ensureUser(command.user_id, timezone);
+}
 
-_Tip: You can also use the ⚡ shortcuts menu → "Set Vacation Dates"_`,
+async function handleHelp(command, args, respond) {
+  await respond({
+    text: HELP_TEXT,
     response_type: 'ephemeral'
   });
 }
 
-async function handleStats(command, respond) {
+async function handleStats(command, args, respond) {
   const stats = getStreakStats(command.user_id, command.channel_id);
 
   if (!stats || stats.total_checkins === 0) {
@@ -93,7 +107,7 @@ async function handleStats(command, respond) {
   await respond({
     text: `📊 *Your Streak Stats*
 
-🔥 Current Streak: *${stats.current_streak} days*
+🔥 Current Streak: *${formatDayCount(stats.current_streak)}*
 ✅ Total Check-ins: *${stats.total_checkins}*
 📅 Last Post: ${stats.last_post_date}
 🎬 Streak Started: ${stats.streak_start_date || 'N/A'}`,
@@ -104,7 +118,7 @@ async function handleStats(command, respond) {
 async function handleDayOff(command, args, respond, client) {
   if (args.length !== 1) {
     await respond({
-      text: '❌ Usage: `/slackline dayoff <date>`\nExample: `/slackline dayoff 2024-12-25`',
+      text: DAYOFF_USAGE,
       response_type: 'ephemeral'
     });
     return;
@@ -113,7 +127,7 @@ async function handleDayOff(command, args, respond, client) {
   const date = args[0];
 
   // Validate date format (basic check)
-  if (!/^\d{4}-\d{2}-\d{2}$/.test(date)) {
+  if (!DATE_PATTERN.test(date)) {
     await respond({
       text: '❌ Invalid date format. Please use YYYY-MM-DD format.',
       response_type: 'ephemeral'
@@ -121,11 +135,7 @@ async function handleDayOff(command, args, respond, client) {
     return;
   }
 
-  // Get user timezone
-  const userInfo = await client.users.info({ user: command.user_id });
-  const timezone = userInfo.user.tz || 'UTC';
-
-  const user = ensureUser(command.user_id, timezone);
+  const user = await ensureCommandUser(command, client);
   addDateRangeDayOff(user.id, date, date);
 
   await respond({
@@ -137,7 +147,7 @@ async function handleDayOff(command, args, respond, client) {
 async function handleVacation(command, args, respond, client) {
   if (args.length !== 2) {
     await respond({
-      text: '❌ Usage: `/slackline vacation <start-date> <end-date>`\nExample: `/slackline vacation 2024-12-20 2024-12-31`',
+      text: VACATION_USAGE,
       response_type: 'ephemeral'
     });
     return;
@@ -146,7 +156,7 @@ async function handleVacation(command, args, respond, client) {
   const [startDate, endDate] = args;
 
   // Validate date formats
-  if (!/^\d{4}-\d{2}-\d{2}$/.test(startDate) || !/^\d{4}-\d{2}-\d{2}$/.test(endDate)) {
+  if (!DATE_PATTERN.test(startDate) || !DATE_PATTERN.test(endDate)) {
     await respond({
       text: '❌ Invalid date format. Please use YYYY-MM-DD format for both dates.',
       response_type: 'ephemeral'
@@ -154,11 +164,7 @@ async function handleVacation(command, args, respond, client) {
     return;
   }
 
-  // Get user timezone
-  const userInfo = await client.users.info({ user: command.user_id });
-  const timezone = userInfo.user.tz || 'UTC';
-
-  const user = ensureUser(command.user_id, timezone);
+  const user = await ensureCommandUser(command, client);
   addDateRangeDayOff(user.id, startDate, endDate);
 
   await respond({
@@ -168,21 +174,19 @@ async function handleVacation(command, args, respond, client) {
 }
 
 async function handleWeekends(command, args, respond, client) {
-  if (args.length !== 1 || !['on', 'off'].includes(args[0].toLowerCase())) {
+  const toggle = args.length === 1 ? args[0].toLowerCase() : null;
+
+  if (toggle !== 'on' && toggle !== 'off') {
     await respond({
-      text: '❌ Usage: `/slackline weekends <on|off>`',
+      text: WEEKENDS_USAGE,
       response_type: 'ephemeral'
     });
     return;
   }
 
-  const enabled = args[0].toLowerCase() === 'on';
+  const enabled = toggle === 'on';
 
-  // Get user timezone
-  const userInfo = await client.users.info({ user: command.user_id });
-  const timezone = userInfo.user.tz || 'UTC';
-
-  const user = ensureUser(command.user_id, timezone);
+  const user = await ensureCommandUser(command, client);
   setWeekendDaysOff(user.id, enabled);
 
   await respond({
@@ -191,11 +195,8 @@ async function handleWeekends(command, args, respond, client) {
   });
 }
 
-async function handleListDaysOff(command, respond, client) {
-  const userInfo = await client.users.info({ user: command.user_id });
-  const timezone = userInfo.user.tz || 'UTC';
-
-  const user = ensureUser(command.user_id, timezone);
+async function handleListDaysOff(command, args, respond, client) {
+  const user = await ensureCommandUser(command, client);
   const daysOff = getUserDaysOff(user.id);
 
   if (daysOff.length === 0) {
@@ -206,39 +207,37 @@ async function handleListDaysOff(command, respond, client) {
     return;
   }
 
-  const weekDays = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'];
-
-  let message = '*Your Days Off:*\n\n';
+  // Split into recurring days and ranges in one pass, formatting as we go
+  const recurring = [];
+  const ranges = [];
+
+  for (const d of daysOff) {
+    if (d.day_type === 'recurring_weekly') {
+      recurring.push(`• ${WEEKDAY_NAMES[d.day_value]}`);
+    } else if (d.day_type === 'date_range') {
+      ranges.push(d.start_date === d.end_date
+        ? `• ${d.start_date}`
+        : `• ${d.start_date} to ${d.end_date}`);
+    }
+  }
 
-  const recurring = daysOff.filter(d => d.day_type === 'recurring_weekly');
-  const ranges = daysOff.filter(d => d.day_type === 'date_range');
+  const lines = ['*Your Days Off:*', ''];
 
   if (recurring.length > 0) {
-    message += '*Recurring Weekly:*\n';
-    recurring.forEach(d => {
-      message += `• ${weekDays[d.day_value]}\n`;
-    });
-    message += '\n';
+    lines.push('*Recurring Weekly:*', ...recurring, '');
   }
 
   if (ranges.length > 0) {
-    message += '*Date Ranges:*\n';
-    ranges.forEach(d => {
-      if (d.start_date === d.end_date) {
-        message += `• ${d.start_date}\n`;
-      } else {
-        message += `• ${d.start_date} to ${d.end_date}\n`;
-      }
-    });
+    lines.push('*Date Ranges:*', ...ranges);
   }
 
   await respond({
-    text: message,
+    text: lines.join('\n') + '\n',
     response_type: 'ephemeral'
   });
 }
 
-async function handleSettings(command, respond, client) {
+async function handleSettings(command, args, respond, client) {
   try {
     // Open the vacation modal
     await client.views.open({
@@ -1,65 +1,90 @@
-import { processCheckin } from '../services/streakService.js';
+import { findChannel, processCheckin } from '../services/streakService.js';
 import { checkAchievement, formatAchievementMessage } from '../services/achievementService.js';
+import { getUserTimezone } from '../utils/slackUtils.js';
+
+// Per-message tracing floods the logs on busy channels, so it only runs with
+// LOG_LEVEL=debug; otherwise a running count is logged every 1000 events
+const DEBUG = process.env.LOG_LEVEL?.toLowerCase() === 'debug';
+const debugLog = DEBUG ? console.log : () => {};
+const MESSAGE_LOG_INTERVAL = 1000;
+let messagesReceived = 0;
 
 /**
  * Handle incoming message events from Slack
  */
 export async function handleMessage({ message, say, client }) {
-  console.log('💬 Received message event:', {
-    user: message.user,
-    channel: message.channel,
-    text: message.text?.substring(0, 50),
-    subtype: message.subtype,
-    thread_ts: message.thread_ts
-  });
+  // Read the fields we use once up front
+  const { user, channel, subtype, thread_ts: threadTs, ts, bot_id: botId } = message;
+
+  messagesReceived++;
+  if (DEBUG) {
+    console.log('💬 Received message event:', {
+      user,
+      channel,
+      text: message.text?.substring(0, 50),
+      subtype,
+      thread_ts: threadTs
+    });
+  } else if (messagesReceived % MESSAGE_LOG_INTERVAL === 0) {
+    console.log(`💬 Received ${messagesReceived} message events`);
+  }
 
   try {
     // Ignore bot messages and threaded replies
-    if (message.subtype || message.thread_ts) {
-      console.log('  ↳ Ignoring: bot message or thread');
+    if (subtype || threadTs) {
+      debugLog('  ↳ Ignoring: bot message or thread');
       return;
     }
 
-    // Ignore messages without user (shouldn't happen, but safety check)
-    if (!message.user) {
-      console.log('  ↳ Ignoring: no user');
+    // Apps posting with a bot token send plain messages that carry bot_id;
+    // drop them before any Slack API call or database work
+    if (botId) {
+      debugLog('  ↳ Ignoring: posted by an app');
       return;
     }
 
-    // Get user's timezone from Slack
-    let timezone = 'UTC';
-    try {
-      const userInfo = await client.users.info({ user: message.user });
-      timezone = userInfo.user.tz || 'UTC';
-    } catch (error) {
-      console.error('Failed to fetch user timezone:', error);
+    // Ignore messages without user (shouldn't happen, but safety check)
+    if (!user) {
+      debugLog('  ↳ Ignoring: no user');
+      return;
     }
 
-    // Get channel name
-    let channelName = 'unknown';
-    try {
-      const channelInfo = await client.conversations.info({ channel: message.channel });
-      channelName = channelInfo.channel.name || 'unknown';
-    } catch (error) {
-      console.error('Failed to fetch channel info:', error);
-    }
+    // Fetch user's timezone and channel name from Slack concurrently,
+    // so the check-in waits on one round trip instead of two. The channel
+    // name is only needed the first time we see a channel.
+    const knownChannel = findChannel(channel);
+    const [timezone, channelName] = await Promise.all([
+      getUserTimezone(client, user)
+        .catch(error => {
+          console.error('Failed to fetch user timezone:', error);
+          return 'UTC';
+        }),
+      knownChannel
+        ? knownChannel.channel_name
+        : client.conversations.info({ channel })
+          .then(channelInfo => channelInfo.channel.name || 'unknown')
+          .catch(error => {
+            console.error('Failed to fetch channel info:', error);
+            return 'unknown';
+          })
+    ]);
 
     // Process the check-in
-    console.log(`  ↳ Processing check-in for user ${message.user} in channel ${channelName}`);
+    debugLog(`  ↳ Processing check-in for user ${user} in channel ${channelName}`);
     const result = processCheckin(
-      message.user,
-      message.channel,
+      user,
+      channel,
       channelName,
       timezone
     );
 
     // If not updated (duplicate post today), do nothing
     if (!result.updated) {
-      console.log(`  ↳ No update needed (already posted today), streak: ${result.streakCount}`);
+      debugLog(`  ↳ No update needed (already posted today), streak: ${result.streakCount}`);
       return;
     }
 
-    console.log(`  ↳ Streak updated! New count: ${result.streakCount}`);
+    debugLog(`  ↳ Streak updated! New count: ${result.streakCount}`);
 
     // Check if this is an achievement
     const achievement = checkAchievement(result.streakCount);
@@ -67,10 +92,10 @@ export async function handleMessage({ message, say, client }) {
     if (achievement) {
       console.log(`  ↳ 🎉 Achievement unlocked at ${result.streakCount} days!`);
       // Post celebration message as a threaded reply
-      const celebrationMessage = formatAchievementMessage(message.user, achievement);
+      const celebrationMessage = formatAchievementMessage(user, achievement);
       await client.chat.postMessage({
-        channel: message.channel,
-        thread_ts: message.ts,
+        channel,
+        thread_ts: ts,
         text: celebrationMessage
       });
     }
@@ -1,3 +1,5 @@
+import { formatDayCount } from '../utils/dateUtils.js';
+
 /**
  * Rusty's Mad-Libs Exclamation Generator! 🐿️
  */
@@ -19,17 +21,20 @@ const RUSTY_VOCAB = {
   ]
 };
 
+const BODY_PARTS = ['bushy tail', 'favorite acorn', 'whiskers', 'fuzzy ears'];
+
+const EXCLAMATION_TEMPLATES = [
+  () => `${pick(RUSTY_VOCAB.intensifiers)} ${pick(RUSTY_VOCAB.nuts).toUpperCase()}!`,
+  () => `${pick(RUSTY_VOCAB.descriptors)} ${pick(RUSTY_VOCAB.nuts)}!`.toUpperCase(),
+  () => `By my ${pick(BODY_PARTS)}!`,
+  () => pick(RUSTY_VOCAB.phrases)
+];
+
 /**
  * Generate a random Rusty-style exclamation
  */
 function generateExclamation() {
-  const templates = [
-    () => `${pick(RUSTY_VOCAB.intensifiers)} ${pick(RUSTY_VOCAB.nuts).toUpperCase()}!`,
-    () => `${pick(RUSTY_VOCAB.descriptors)} ${pick(RUSTY_VOCAB.nuts)}!`.toUpperCase(),
-    () => `By my ${pick(['bushy tail', 'favorite acorn', 'whiskers', 'fuzzy ears'])}!`,
-    () => pick(RUSTY_VOCAB.phrases)
-  ];
-  return pick(templates)();
+  return pick(EXCLAMATION_TEMPLATES)();
 }
 
 /**
@@ -66,9 +71,18 @@ const MILESTONES = [
   { days: 1000, message: () => `🚨 ACORN ALERT! ACORN ALERT! 🚨 *climbs to highest branch and SCREAMS* ONE THOUSAND DAYS! ${generateExclamation()} I'm organizing a parade! With ${pick(RUSTY_VOCAB.nuts)}! SO MANY ${pick(RUSTY_VOCAB.nuts).toUpperCase()}! ${pick(RUSTY_VOCAB.phrases)} 🎆🐿️🌰` }
 ];
 
+// Milestones keyed by day count, checked on every check-in
+const MILESTONES_BY_DAYS = new Map(MILESTONES.map(m => [m.days, m]));
+
 // After 1000, celebrate every 250 days
 const ONGOING_MILESTONE_INTERVAL = 250;
 
+const ONGOING_TEMPLATES = [
+  (days) => `${generateAction()} ${days} DAYS?! ${generateExclamation()} I'm running out of ${pick(RUSTY_VOCAB.nuts)} to celebrate with! You're absolutely INCREDIBLE! 🌟🐿️🌰`,
+  (days) => `${generateExclamation()} ${days} days?! ${generateAction()} This is ${pick(RUSTY_VOCAB.nature)} and completely NUTS! You're a legend! 🌰✨`,
+  (days) => `${generateExclamation()} ${days} DAYS?! I'm gonna need a bigger ${pick(RUSTY_VOCAB.trees)} to store all these celebration ${pick(RUSTY_VOCAB.nuts)}! ${pick(RUSTY_VOCAB.nature)}! 🌲🐿️`
+];
+
 /**
  * Check if current streak count is an achievement milestone
  * @param {number} streakCount - Current streak count
@@ -76,7 +90,7 @@ const ONGOING_MILESTONE_INTERVAL = 250;
  */
 export function checkAchievement(streakCount) {
   // Check predefined milestones
-  const milestone = MILESTONES.find(m => m.days === streakCount);
+  const milestone = MILESTONES_BY_DAYS.get(streakCount);
   if (milestone) {
     return {
       days: milestone.days,
@@ -86,14 +100,9 @@ export function checkAchievement(streakCount) {
 
   // Check ongoing milestones (every 250 after 1000) - fully mad-libs style!
   if (streakCount > 1000 && streakCount % ONGOING_MILESTONE_INTERVAL === 0) {
-    const ongoingTemplates = [
-      () => `${generateAction()} ${streakCount} DAYS?! ${generateExclamation()} I'm running out of ${pick(RUSTY_VOCAB.nuts)} to celebrate with! You're absolutely INCREDIBLE! 🌟🐿️🌰`,
-      () => `${generateExclamation()} ${streakCount} days?! ${generateAction()} This is ${pick(RUSTY_VOCAB.nature)} and completely NUTS! You're a legend! 🌰✨`,
-      () => `${generateExclamation()} ${streakCount} DAYS?! I'm gonna need a bigger ${pick(RUSTY_VOCAB.trees)} to store all these celebration ${pick(RUSTY_VOCAB.nuts)}! ${pick(RUSTY_VOCAB.nature)}! 🌲🐿️`
-    ];
     return {
       days: streakCount,
-      message: pick(ongoingTemplates)()
+      message: pick(ONGOING_TEMPLATES)(streakCount)
     };
   }
 
@@ -104,10 +113,9 @@ export function checkAchievement(streakCount) {
  * Format achievement celebration message
  */
 export function formatAchievementMessage(userId, achievement) {
-  const dayText = achievement.days === 1 ? 'day' : 'days';
   return `🐿️ *Rusty the Roundabout Squirrel scampers in* 🐿️
 
-HEY <@${userId}>! You've hit **${achievement.days} ${dayText}** on the slackline!
+HEY <@${userId}>! You've hit **${formatDayCount(achievement.days)}** on the slackline!
 
 ${achievement.message}`;
 }
@@ -1,12 +1,22 @@
-import { getDatabase } from '../database/db.js';
+import { getDatabase, prepareCached } from '../database/db.js';
 
 /**
  * Get all days off for a user
+ * If sinceDate (YYYY-MM-DD) is given, date ranges that ended before it are skipped
  */
-export function getUserDaysOff(userId) {
+export function getUserDaysOff(userId, sinceDate = null) {
   const db = getDatabase();
-  return db.prepare(`
-    SELECT * FROM days_off WHERE user_id = ?
+
+  // Only the columns isDayOff and the listing use, to keep row objects small
+  if (sinceDate) {
+    return prepareCached(db, `
+      SELECT id, day_type, day_value, start_date, end_date FROM days_off
+      WHERE user_id = ? AND (day_type = 'recurring_weekly' OR end_date >= ?)
+    `).all(userId, sinceDate);
+  }
+
+  return prepareCached(db, `
+    SELECT id, day_type, day_value, start_date, end_date FROM days_off WHERE user_id = ?
   `).all(userId);
 }
 
@@ -17,7 +27,7 @@ export function addRecurringDayOff(userId, dayValue) {
   const db = getDatabase();
 
   // Check if already exists
-  const existing = db.prepare(`
+  const existing = prepareCached(db, `
     SELECT id FROM days_off
     WHERE user_id = ? AND day_type = 'recurring_weekly' AND day_value = ?
   `).get(userId, dayValue);
@@ -26,7 +36,7 @@ export function addRecurringDayOff(userId, dayValue) {
     return existing.id;
   }
 
-  const result = db.prepare(`
+  const result = prepareCached(db, `
     INSERT INTO days_off (user_id, day_type, day_value)
     VALUES (?, 'recurring_weekly', ?)
   `).run(userId, dayValue);
@@ -40,7 +50,7 @@ export function addRecurringDayOff(userId, dayValue) {
 export function addDateRangeDayOff(userId, startDate, endDate) {
   const db = getDatabase();
 
-  const result = db.prepare(`
+  const result = prepareCached(db, `
     INSERT INTO days_off (user_id, day_type, start_date, end_date)
     VALUES (?, 'date_range', ?, ?)
   `).run(userId, startDate, endDate);
@@ -54,7 +64,7 @@ export function addDateRangeDayOff(userId, startDate, endDate) {
 export function removeDayOff(userId, dayOffId) {
   const db = getDatabase();
 
-  const result = db.prepare(`
+  const result = prepareCached(db, `
     DELETE FROM days_off WHERE id = ? AND user_id = ?
   `).run(dayOffId, userId);
 
@@ -67,7 +77,7 @@ export function removeDayOff(userId, dayOffId) {
 export function removeAllRecurringDaysOff(userId) {
   const db = getDatabase();
 
-  const result = db.prepare(`
+  const result = prepareCached(db, `
     DELETE FROM days_off WHERE user_id = ? AND day_type = 'recurring_weekly'
   `).run(userId);
 
@@ -78,12 +88,17 @@ export function removeAllRecurringDaysOff(userId) {
  * Set weekend days off (Saturday and Sunday)
  */
 export function setWeekendDaysOff(userId, enabled) {
+  const db = getDatabase();
+
   if (enabled) {
-    addRecurringDayOff(userId, 0); // Sunday
-    addRecurringDayOff(userId, 6); // Saturday
+    // Write both days in one transaction rather than committing each separately,
+    // taking the write lock up front so it isn't upgraded mid-transaction
+    db.transaction(() => {
+      addRecurringDayOff(userId, 0); // Sunday
+      addRecurringDayOff(userId, 6); // Saturday
+    }).immediate();
   } else {
-    const db = getDatabase();
-    db.prepare(`
+    prepareCached(db, `
       DELETE FROM days_off
       WHERE user_id = ? AND day_type = 'recurring_weekly' AND day_value IN (0, 6)
     `).run(userId);
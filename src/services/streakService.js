@@ -1,51 +1,99 @@
-import { getDatabase } from '../database/db.js';
+import { getDatabase, prepareCached } from '../database/db.js';
 import { getUserDaysOff } from './daysOffService.js';
-import { getCurrentDateInTimezone, isDayOff, parseDate } from '../utils/dateUtils.js';
+import { ONE_DAY, getCurrentDateInTimezone, isDayOff, parseDate } from '../utils/dateUtils.js';
+
+/**
+ * Create an in-process row cache scoped to a database connection,
+ * so tests that swap connections never see rows from another database
+ */
+function createConnectionCache() {
+  const caches = new WeakMap();
+  return (db) => {
+    let cache = caches.get(db);
+    if (!cache) {
+      cache = new Map();
+      caches.set(db, cache);
+    }
+    return cache;
+  };
+}
+
+// User and channel rows are looked up on every check-in but rarely change,
+// so keep them in memory keyed by Slack ID to skip a SELECT per message
+const getUserCache = createConnectionCache();
+const getChannelCache = createConnectionCache();
+
+// Users often post several times a day; remember who has already checked in
+// today so duplicates return without opening a write transaction
+const getCheckinCache = createConnectionCache();
 
 /**
  * Ensure user exists in database, create if not
  */
 export function ensureUser(slackUserId, timezone = 'UTC') {
   const db = getDatabase();
+  const cache = getUserCache(db);
 
-  let user = db.prepare('SELECT * FROM users WHERE slack_user_id = ?').get(slackUserId);
+  let user = cache.get(slackUserId) ||
+    prepareCached(db, 'SELECT * FROM users WHERE slack_user_id = ?').get(slackUserId);
 
   if (!user) {
-    const result = db.prepare(`
+    user = prepareCached(db, `
       INSERT INTO users (slack_user_id, slack_timezone)
       VALUES (?, ?)
-    `).run(slackUserId, timezone);
-
-    user = db.prepare('SELECT * FROM users WHERE id = ?').get(result.lastInsertRowid);
+      RETURNING *
+    `).get(slackUserId, timezone);
   } else if (user.slack_timezone !== timezone) {
     // Update timezone if changed
-    db.prepare(`
+    prepareCached(db, `
       UPDATE users SET slack_timezone = ?, updated_at = datetime('now')
       WHERE id = ?
     `).run(timezone, user.id);
     user.slack_timezone = timezone;
   }
 
+  cache.set(slackUserId, user);
   return user;
 }
 
 /**
- * Ensure channel exists in database
+ * Look up a channel without creating it
+ * Returns the channel row or null if the channel hasn't been seen yet
  */
-export function ensureChannel(slackChannelId, channelName) {
+export function findChannel(slackChannelId) {
   const db = getDatabase();
+  const cache = getChannelCache(db);
 
-  let channel = db.prepare('SELECT * FROM channels WHERE slack_channel_id = ?').get(slackChannelId);
-
+  let channel = cache.get(slackChannelId);
   if (!channel) {
-    const result = db.prepare(`
-      INSERT INTO channels (slack_channel_id, channel_name)
-      VALUES (?, ?)
-    `).run(slackChannelId, channelName);
+    channel = prepareCached(db, 'SELECT * FROM channels WHERE slack_channel_id = ?').get(slackChannelId);
+    if (!channel) {
+      return null;
+    }
+    cache.set(slackChannelId, channel);
+  }
 
-    channel = db.prepare('SELECT * FROM channels WHERE id = ?').get(result.lastInsertRowid);
+  return channel;
+}
+
+/**
+ * Ensure channel exists in database
+ */
+export function ensureChannel(slackChannelId, channelName) {
+  let channel = findChannel(slackChannelId);
+  if (channel) {
+    return channel;
   }
 
+  const db = getDatabase();
+
+  channel = prepareCached(db, `
+    INSERT INTO channels (slack_channel_id, channel_name)
+    VALUES (?, ?)
+    RETURNING *
+  `).get(slackChannelId, channelName);
+
+  getChannelCache(db).set(slackChannelId, channel);
   return channel;
 }
 
@@ -55,17 +103,16 @@ export function ensureChannel(slackChannelId, channelName) {
 export function getStreak(userId, channelId) {
   const db = getDatabase();
 
-  let streak = db.prepare(`
+  let streak = prepareCached(db, `
     SELECT * FROM streaks WHERE user_id = ? AND channel_id = ?
   `).get(userId, channelId);
 
   if (!streak) {
-    const result = db.prepare(`
+    streak = prepareCached(db, `
       INSERT INTO streaks (user_id, channel_id, current_streak, total_checkins)
       VALUES (?, ?, 0, 0)
-    `).run(userId, channelId);
-
-    streak = db.prepare('SELECT * FROM streaks WHERE id = ?').get(result.lastInsertRowid);
+      RETURNING *
+    `).get(userId, channelId);
   }
 
   return streak;
@@ -77,41 +124,77 @@ export function getStreak(userId, channelId) {
  */
 export function processCheckin(slackUserId, slackChannelId, channelName, timezone = 'UTC') {
   const db = getDatabase();
+  const checkins = getCheckinCache(db);
+  const checkinKey = `${slackUserId}:${slackChannelId}`;
+
+  // Get current date in user's timezone
+  const today = getCurrentDateInTimezone(timezone);
+
+  const lastCheckin = checkins.get(checkinKey);
+  if (lastCheckin && lastCheckin.date === today && lastCheckin.timezone === timezone) {
+    return {
+      updated: false,
+      streakCount: lastCheckin.streakCount,
+      isNewAchievement: false
+    };
+  }
+
+  // Run every read and write for the check-in in one transaction,
+  // so a new user/channel/streak plus the update commit together. BEGIN IMMEDIATE
+  // takes the write lock before the reads, instead of upgrading mid-transaction
+  let result;
+  try {
+    result = db.transaction(recordCheckin).immediate(db, slackUserId, slackChannelId, channelName, timezone, today);
+  } catch (error) {
+    // Rows created inside the rolled-back transaction may have been cached
+    getUserCache(db).delete(slackUserId);
+    getChannelCache(db).delete(slackChannelId);
+    checkins.delete(checkinKey);
+    throw error;
+  }
+
+  checkins.set(checkinKey, { date: today, timezone, streakCount: result.streakCount });
+  return result;
+}
 
+function recordCheckin(db, slackUserId, slackChannelId, channelName, timezone, today) {
   // Ensure user and channel exist
   const user = ensureUser(slackUserId, timezone);
   const channel = ensureChannel(slackChannelId, channelName);
 
-  // Get current date in user's timezone
-  const today = getCurrentDateInTimezone(timezone);
-
-  // Get or create streak
+  // Get or create streak, reading the fields used below once
   const streak = getStreak(user.id, channel.id);
+  const {
+    current_streak: currentStreak,
+    last_post_date: lastPost,
+    streak_start_date: streakStart
+  } = streak;
 
   // If user already posted today, ignore (idempotent)
-  if (streak.last_post_date === today) {
+  if (lastPost === today) {
     return {
       updated: false,
-      streakCount: streak.current_streak,
+      streakCount: currentStreak,
       isNewAchievement: false
     };
   }
 
-  // Get user's days off
-  const daysOff = getUserDaysOff(user.id);
-
   // Calculate new streak
   let newStreak = 1;
   let streakStartDate = today;
 
-  if (streak.last_post_date) {
+  if (lastPost) {
+    // Only days off from the last post onwards can affect the streak,
+    // so skip vacations that have already ended
+    const daysOff = getUserDaysOff(user.id, lastPost);
+
     // Check if streak continues
-    const lastPostDate = parseDate(streak.last_post_date, timezone);
+    const lastPostDate = parseDate(lastPost, timezone);
     const todayDate = parseDate(today, timezone);
 
     // Count working days between last post and today
     let expectedNextDay = lastPostDate;
-    let currentDay = lastPostDate.plus({ days: 1 });
+    let currentDay = lastPostDate.plus(ONE_DAY);
 
     // Find the next expected working day after last post
     while (currentDay < todayDate) {
@@ -119,21 +202,21 @@ export function processCheckin(slackUserId, slackChannelId, channelName, timezon
         expectedNextDay = currentDay;
         break;
       }
-      currentDay = currentDay.plus({ days: 1 });
+      currentDay = currentDay.plus(ONE_DAY);
     }
 
     // Check if today is the expected next working day
     if (expectedNextDay.toISODate() === today ||
-        (expectedNextDay < todayDate && !isDayOff(today, daysOff))) {
+        (expectedNextDay < todayDate && !isDayOff(today, daysOff, todayDate.weekday))) {
       // Streak continues
-      newStreak = streak.current_streak + 1;
-      streakStartDate = streak.streak_start_date || streak.last_post_date;
+      newStreak = currentStreak + 1;
+      streakStartDate = streakStart || lastPost;
     }
     // else: streak broken, reset to 1
   }
 
   // Update streak in database
-  db.prepare(`
+  prepareCached(db, `
     UPDATE streaks
     SET current_streak = ?,
         last_post_date = ?,
@@ -146,8 +229,8 @@ export function processCheckin(slackUserId, slackChannelId, channelName, timezon
   return {
     updated: true,
     streakCount: newStreak,
-    isNewAchievement: newStreak === 1 || newStreak > streak.current_streak,
-    wasReset: newStreak === 1 && streak.current_streak > 1
+    isNewAchievement: newStreak === 1 || newStreak > currentStreak,
+    wasReset: newStreak === 1 && currentStreak > 1
   };
 }
 
@@ -157,7 +240,7 @@ export function processCheckin(slackUserId, slackChannelId, channelName, timezon
 export function getStreakStats(slackUserId, slackChannelId) {
   const db = getDatabase();
 
-  const result = db.prepare(`
+  const result = prepareCached(db, `
     SELECT
       s.current_streak,
       s.total_checkins,
@@ -1,10 +1,14 @@
-import { DateTime } from 'luxon';
+import { DateTime, Duration } from 'luxon';
+
+// Built once so day-by-day loops don't normalize a fresh duration object per step
+export const ONE_DAY = Duration.fromObject({ days: 1 });
 
 /**
  * Get current date in user's timezone as YYYY-MM-DD string
  */
 export function getCurrentDateInTimezone(timezone = 'UTC') {
-  return DateTime.now().setZone(timezone).toISODate();
+  // Create the DateTime directly in the target zone rather than converting from local time
+  return DateTime.local({ zone: timezone }).toISODate();
 }
 
 /**
@@ -33,7 +37,7 @@ export function getWorkingDaysBetween(startDate, endDate, daysOff = [], timezone
     if (!isDayOff(current.toISODate(), daysOff, current.weekday)) {
       count++;
     }
-    current = current.plus({ days: 1 });
+    current = current.plus(ONE_DAY);
   }
 
   return count;
@@ -43,20 +47,22 @@ export function getWorkingDaysBetween(startDate, endDate, daysOff = [], timezone
  * Check if a specific date is a day off
  */
 export function isDayOff(dateStr, daysOff = [], weekday = null) {
-  const date = DateTime.fromISO(dateStr);
-  const dayOfWeek = weekday || date.weekday; // 1=Monday, 7=Sunday
+  // Weekday in days_off numbering, resolved once on the first recurring entry
+  let sqliteDayOfWeek = -1;
 
   for (const dayOff of daysOff) {
     if (dayOff.day_type === 'recurring_weekly') {
-      // Convert weekday: SQLite uses 0=Sunday, Luxon uses 7=Sunday
-      const sqliteDayOfWeek = dayOfWeek === 7 ? 0 : dayOfWeek;
+      if (sqliteDayOfWeek === -1) {
+        const dayOfWeek = weekday || DateTime.fromISO(dateStr).weekday; // 1=Monday, 7=Sunday
+        // Convert weekday: SQLite uses 0=Sunday, Luxon uses 7=Sunday
+        sqliteDayOfWeek = dayOfWeek % 7;
+      }
       if (dayOff.day_value === sqliteDayOfWeek) {
         return true;
       }
     } else if (dayOff.day_type === 'date_range') {
-      const startDate = DateTime.fromISO(dayOff.start_date);
-      const endDate = DateTime.fromISO(dayOff.end_date);
-      if (date >= startDate && date <= endDate) {
+      // YYYY-MM-DD strings sort chronologically, so no parsing is needed
+      if (dateStr >= dayOff.start_date && dateStr <= dayOff.end_date) {
         return true;
       }
     }
@@ -69,18 +75,25 @@ export function isDayOff(dateStr, daysOff = [], weekday = null) {
  * Get the date for yesterday in user's timezone
  */
 export function getYesterdayInTimezone(timezone = 'UTC') {
-  return DateTime.now().setZone(timezone).minus({ days: 1 }).toISODate();
+  return DateTime.local({ zone: timezone }).minus(ONE_DAY).toISODate();
 }
 
 /**
  * Find the next working day after a given date
  */
 export function getNextWorkingDay(dateStr, daysOff = [], timezone = 'UTC') {
-  let current = DateTime.fromISO(dateStr, { zone: timezone }).plus({ days: 1 });
+  let current = DateTime.fromISO(dateStr, { zone: timezone }).plus(ONE_DAY);
 
   while (isDayOff(current.toISODate(), daysOff, current.weekday)) {
-    current = current.plus({ days: 1 });
+    current = current.plus(ONE_DAY);
   }
 
   return current.toISODate();
 }
+
+/**
+ * Format a day count with the right plural, e.g. "1 day" or "5 days"
+ */
+export function formatDayCount(count) {
+  return `${count} ${count === 1 ? 'day' : 'days'}`;
+}
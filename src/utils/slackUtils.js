@@ -0,0 +1,20 @@
+// Timezones rarely change, so remember them for a while instead of calling
+// users.info on every message and command
+const TIMEZONE_CACHE_TTL_MS = 10 * 60 * 1000;
+const timezoneCache = new Map();
+
+/**
+ * Get a user's timezone from their Slack profile, defaulting to UTC
+ */
+export async function getUserTimezone(client, slackUserId) {
+  const cached = timezoneCache.get(slackUserId);
+  if (cached && cached.expiresAt > Date.now()) {
+    return cached.timezone;
+  }
+
+  const userInfo = await client.users.info({ user: slackUserId });
+  const timezone = userInfo.user.tz || 'UTC';
+
+  timezoneCache.set(slackUserId, { timezone, expiresAt: Date.now() + TIMEZONE_CACHE_TTL_MS });
+  return timezone;
+}
@@ -1,6 +1,6 @@
 import { describe, it, expect, beforeEach, afterEach } from 'vitest';
-import { initializeDatabase } from '../../src/database/db.js';
-import { unlinkSync, existsSync } from 'fs';
+import { initializeDatabase, prepareCached } from '../../src/database/db.js';
+import { unlinkSync, existsSync, rmSync } from 'fs';
 
 const TEST_DB_PATH = './test-slackline.db';
 
@@ -46,4 +46,28 @@ describe('Database Initialization', () => {
     const fkStatus = db.pragma('foreign_keys', { simple: true });
     expect(fkStatus).toBe(1);
   });
+
+  it('should reuse prepared statements for the same SQL', () => {
+    const first = prepareCached(db, 'SELECT COUNT(*) AS n FROM users');
+    const second = prepareCached(db, 'SELECT COUNT(*) AS n FROM users');
+
+    expect(second).toBe(first);
+    expect(second.get().n).toBe(0);
+  });
+
+  it('should use WAL journal mode', () => {
+    const journalMode = db.pragma('journal_mode', { simple: true });
+    expect(journalMode).toBe('wal');
+  });
+
+  it('should create a missing data directory', () => {
+    const nestedDir = './test-db-dir';
+    rmSync(nestedDir, { recursive: true, force: true });
+
+    const nestedDb = initializeDatabase(`${nestedDir}/nested/test.db`);
+    nestedDb.close();
+
+    expect(existsSync(`${nestedDir}/nested/test.db`)).toBe(true);
+    rmSync(nestedDir, { recursive: true, force: true });
+  });
 });
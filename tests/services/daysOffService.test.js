@@ -66,6 +66,17 @@ describe('Days Off Service', () => {
     expect(daysOff[0].end_date).toBe('2024-12-31');
   });
 
+  it('should skip date ranges that ended before the given date', () => {
+    addRecurringDayOff(testUserId, 6);
+    addDateRangeDayOff(testUserId, '2024-06-01', '2024-06-10');
+    addDateRangeDayOff(testUserId, '2024-12-20', '2024-12-31');
+
+    const daysOff = getUserDaysOff(testUserId, '2024-12-01');
+    expect(daysOff).toHaveLength(2);
+    expect(daysOff.map(d => d.day_type).sort()).toEqual(['date_range', 'recurring_weekly']);
+    expect(daysOff.find(d => d.day_type === 'date_range').start_date).toBe('2024-12-20');
+  });
+
   it('should set weekend days off', () => {
     setWeekendDaysOff(testUserId, true);
 
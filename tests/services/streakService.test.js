@@ -3,6 +3,7 @@ import { initializeDatabase } from '../../src/database/db.js';
 import {
   ensureUser,
   ensureChannel,
+  findChannel,
   processCheckin,
   getStreakStats
 } from '../../src/services/streakService.js';
@@ -42,12 +43,39 @@ describe('Streak Service', () => {
     expect(user1.id).toBe(user2.id);
   });
 
+  it('should update timezone for existing user', () => {
+    ensureUser('U123', 'America/New_York');
+    const user = ensureUser('U123', 'Europe/London');
+    expect(user.slack_timezone).toBe('Europe/London');
+
+    const row = db.prepare('SELECT slack_timezone FROM users WHERE slack_user_id = ?').get('U123');
+    expect(row.slack_timezone).toBe('Europe/London');
+  });
+
   it('should create channel if not exists', () => {
     const channel = ensureChannel('C123', 'general');
     expect(channel).toBeTruthy();
     expect(channel.slack_channel_id).toBe('C123');
   });
 
+  it('should return existing channel', () => {
+    const channel1 = ensureChannel('C123', 'general');
+    const channel2 = ensureChannel('C123', 'general');
+    expect(channel1.id).toBe(channel2.id);
+
+    const count = db.prepare('SELECT COUNT(*) AS n FROM channels').get().n;
+    expect(count).toBe(1);
+  });
+
+  it('should find only channels that have been seen', () => {
+    expect(findChannel('C123')).toBeNull();
+
+    ensureChannel('C123', 'general');
+    const channel = findChannel('C123');
+    expect(channel).toBeTruthy();
+    expect(channel.channel_name).toBe('general');
+  });
+
   it('should process first check-in', () => {
     const result = processCheckin('U123', 'C123', 'general', 'UTC');
 
@@ -64,6 +92,19 @@ describe('Streak Service', () => {
     expect(result.streakCount).toBe(1);
   });
 
+  it('should not reuse duplicate check-ins from another database', () => {
+    processCheckin('U123', 'C123', 'general', 'UTC');
+
+    const otherDb = initializeDatabase(':memory:');
+    global.__db = otherDb;
+    const result = processCheckin('U123', 'C123', 'general', 'UTC');
+    otherDb.close();
+    global.__db = db;
+
+    expect(result.updated).toBe(true);
+    expect(result.streakCount).toBe(1);
+  });
+
   it('should get streak stats', () => {
     processCheckin('U123', 'C123', 'general', 'UTC');
 
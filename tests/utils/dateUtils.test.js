@@ -3,7 +3,8 @@ import {
   getCurrentDateInTimezone,
   isDayOff,
   getWorkingDaysBetween,
-  getNextWorkingDay
+  getNextWorkingDay,
+  formatDayCount
 } from '../../src/utils/dateUtils.js';
 
 describe('Date Utilities', () => {
@@ -89,4 +90,15 @@ describe('Date Utilities', () => {
       expect(nextDay).toBe('2024-01-08');
     });
   });
+
+  describe('formatDayCount', () => {
+    it('should use singular for one day', () => {
+      expect(formatDayCount(1)).toBe('1 day');
+    });
+
+    it('should use plural otherwise', () => {
+      expect(formatDayCount(0)).toBe('0 days');
+      expect(formatDayCount(5)).toBe('5 days');
+    });
+  });
 });
@@ -0,0 +1,39 @@
+import { describe, it, expect } from 'vitest';
+import { getUserTimezone } from '../../src/utils/slackUtils.js';
+
+function fakeClient(tz) {
+  const client = {
+    calls: 0,
+    users: {
+      info: async ({ user }) => {
+        client.calls++;
+        return { user: { id: user, tz } };
+      }
+    }
+  };
+  return client;
+}
+
+describe('Slack Utilities', () => {
+  describe('getUserTimezone', () => {
+    it('should return the timezone from the user profile', async () => {
+      const timezone = await getUserTimezone(fakeClient('America/New_York'), 'U123');
+      expect(timezone).toBe('America/New_York');
+    });
+
+    it('should default to UTC when the profile has no timezone', async () => {
+      const timezone = await getUserTimezone(fakeClient(undefined), 'U456');
+      expect(timezone).toBe('UTC');
+    });
+
+    it('should cache the timezone between calls', async () => {
+      const client = fakeClient('Europe/London');
+
+      await getUserTimezone(client, 'U789');
+      const timezone = await getUserTimezone(client, 'U789');
+
+      expect(timezone).toBe('Europe/London');
+      expect(client.calls).toBe(1);
+    });
+  });
+});